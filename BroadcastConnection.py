@@ -0,0 +1,197 @@
+from threading import Condition, Lock
+from typing import Callable, Dict, List, Literal, Optional
+from ConnectionInterface import ConnectionInterface
+from Deadline import Deadline
+
+
+class _Subscription:
+    """
+    Read position and counters of one listening thread.
+    """
+
+    def __init__(self, cursor: int) -> None:
+        self.cursor = cursor
+        self.connected = True
+        self.delivered = 0
+        self.dropped = 0
+
+
+class BroadcastConnection(ConnectionInterface):
+    """
+    Publish/subscribe connection where every send() is delivered to every listen() subscriber.
+
+    Sent data is stored once in a ring buffer of `capacity` slots and each subscriber reads it
+    through its own cursor, so all subscribers receive the same object and the publisher's cost
+    does not grow with the number of subscribers. A subscriber sees the data sent after its
+    listen() call started; subscribers drain all available data per wake-up.
+
+    When a subscriber falls `capacity` messages behind, slow_subscriber decides what happens:
+    - 'block': send() waits until the slowest subscriber has caught up
+    - 'skip': the subscriber skips ahead to the oldest data still in the ring, counting what it dropped
+    - 'disconnect': the subscriber is disconnected and its listen() returns
+
+    Broadcast connections are unidirectional; replies of the handlers are discarded.
+
+    Example:
+        ticks = Connection('broadcast', bidirectional=False, capacity=256, slow_subscriber='skip')
+        # several components call ticks.listen(handler) in their threads
+        ticks.send("tick")
+    """
+
+    def __init__(self, bidirectional: bool = False, contract=None, cache=None, capacity: int = 1024,
+                 slow_subscriber: Literal['block', 'skip', 'disconnect'] = 'block') -> None:
+        """
+        Initialize the BroadcastConnection.
+
+        Args:
+            bidirectional: Must be False, broadcasts are not replied to.
+            contract: Optional DataContract for serialization/deserialization. Defaults to None.
+            cache: Optional HandlerCache wrapped around handlers passed to listen(). Defaults to None.
+            capacity: Number of messages kept in the ring buffer. Defaults to 1024.
+            slow_subscriber: What to do with a subscriber that falls capacity messages behind:
+                             'block', 'skip' or 'disconnect'. Defaults to 'block'.
+
+        Raises:
+            ValueError: If bidirectional is True, capacity is smaller than 1 or slow_subscriber is unknown.
+        """
+        if bidirectional:
+            raise ValueError("Broadcast connections are unidirectional, create them with bidirectional=False")
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+        if slow_subscriber not in ('block', 'skip', 'disconnect'):
+            raise ValueError(f"Unsupported slow_subscriber policy: {slow_subscriber}. Supported: 'block', 'skip', 'disconnect'")
+        super().__init__(bidirectional, contract, cache)
+
+        self.capacity = capacity
+        self.slow_subscriber = slow_subscriber
+        self._ring: List = [None] * capacity
+        self._sequence = 0  # Sequence number of the next message to be written
+        self._lock = Lock()
+        self._readable = Condition(self._lock)
+        self._writable = Condition(self._lock)
+        self._publishers_waiting = 0  # Publishers blocked by the 'block' policy
+        self._min_cursor = 0  # Lower bound of all subscriber cursors, recomputed only when the ring looks full
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._next_subscription_id = 0
+        self._closed = False
+
+    def _refresh_min_cursor(self) -> None:
+        """
+        Recompute the cursor of the slowest subscriber. Must be called with the lock held.
+        """
+        cursors = [subscription.cursor for subscription in self._subscriptions.values()]
+        self._min_cursor = min(cursors) if cursors else self._sequence
+
+    def send(self, data: str, priority: int = 0, timeout: Optional[float] = None) -> str:
+        """
+        Publish data to all current subscribers.
+
+        Args:
+            data: The data to be sent as a string.
+            priority: Ignored, all subscribers read in publication order.
+            timeout: Seconds the 'block' policy may wait for the slowest subscriber. The deadline of the
+                     request being handled by the calling thread, if any, also applies. Defaults to None.
+
+        Returns:
+            The data that was sent.
+
+        Raises:
+            TimeoutError: If the 'block' policy is still waiting when the deadline passes.
+        """
+        deadline = Deadline.resolve(timeout)
+        with self._lock:
+            # Subscribers skip ahead by themselves, the other policies need the slowest cursor
+            if self.slow_subscriber != 'skip' and self._sequence - self._min_cursor >= self.capacity:
+                self._refresh_min_cursor()
+                if self.slow_subscriber == 'block':
+                    while self._sequence - self._min_cursor >= self.capacity:
+                        if Deadline.expired(deadline):
+                            raise TimeoutError("Slowest broadcast subscriber did not catch up within the deadline")
+                        self._publishers_waiting += 1
+                        try:
+                            self._writable.wait(Deadline.remaining(deadline))
+                        finally:
+                            self._publishers_waiting -= 1
+                        self._refresh_min_cursor()
+                elif self.slow_subscriber == 'disconnect' and self._sequence - self._min_cursor >= self.capacity:
+                    for subscription in self._subscriptions.values():
+                        if self._sequence - subscription.cursor >= self.capacity:
+                            subscription.connected = False
+                    self._subscriptions = {key: subscription for key, subscription in self._subscriptions.items() if subscription.connected}
+                    self._refresh_min_cursor()
+
+            self._ring[self._sequence % self.capacity] = data
+            self._sequence += 1
+            self._readable.notify_all()
+        return data
+
+    def listen(self, handler: Callable[[str], str]) -> None:
+        """
+        Subscribe and process every message published from now on with the handler function.
+        Returns when stop_listening() is called and all published messages were processed,
+        or when the subscriber is disconnected for being too slow.
+
+        Args:
+            handler: A callable function to process incoming data. Its return value is ignored.
+        """
+        handler = self._wrap_handler(handler)
+        with self._lock:
+            subscription = _Subscription(self._sequence)
+            subscription_id = self._next_subscription_id
+            self._next_subscription_id += 1
+            self._subscriptions[subscription_id] = subscription
+
+        try:
+            while True:
+                with self._lock:
+                    while subscription.connected and subscription.cursor == self._sequence and not self._closed:
+                        self._readable.wait()
+                    if not subscription.connected or subscription.cursor == self._sequence:
+                        break
+
+                    # With the 'skip' policy older slots may have been overwritten already
+                    oldest = self._sequence - self.capacity
+                    if subscription.cursor < oldest:
+                        subscription.dropped += oldest - subscription.cursor
+                        subscription.cursor = oldest
+
+                    batch = [self._ring[sequence % self.capacity] for sequence in range(subscription.cursor, self._sequence)]
+                    subscription.cursor = self._sequence
+                    if self._publishers_waiting:
+                        # The cursor may free several slots, so wake every blocked publisher to recheck
+                        self._writable.notify_all()
+
+                for data in batch:
+                    handler(data)
+                    subscription.delivered += 1
+        finally:
+            with self._lock:
+                self._subscriptions.pop(subscription_id, None)
+                if self._publishers_waiting:
+                    self._writable.notify_all()
+
+    def stop_listening(self) -> None:
+        """
+        Stop all subscribers once they have processed the messages published so far.
+        """
+        with self._lock:
+            self._closed = True
+            self._readable.notify_all()
+
+    def stats(self) -> List[dict]:
+        """
+        Return per-subscriber metrics.
+
+        Returns:
+            A list with a dict per current subscriber with keys 'lag' (messages not yet read),
+            'delivered' and 'dropped' (messages skipped by the 'skip' policy).
+        """
+        with self._lock:
+            return [
+                {
+                    'lag': self._sequence - subscription.cursor,
+                    'delivered': subscription.delivered,
+                    'dropped': subscription.dropped,
+                }
+                for subscription in self._subscriptions.values()
+            ]
@@ -1,4 +1,5 @@
 import threading
+import weakref
 from typing import List, Callable, Dict
 from ConnectionInterface import ConnectionInterface
 
@@ -7,8 +8,12 @@ class Component:
     """
     Class that manages running multiple methods in separate threads.
     Methods can access connections through self.connections.
+    Threads are named '<ComponentClass>.<method>' so they can be told apart in profiles.
     """
 
+    # All threads started by any component, used by the Profiler to select what to sample
+    running_threads: weakref.WeakSet = weakref.WeakSet()
+
     def __init__(self, **connections: ConnectionInterface) -> None:
         """
         Initialize the Component.
@@ -49,8 +54,9 @@ class Component:
         """
         for method in self.methods:
             # Create a thread for each method
-            thread = threading.Thread(target=method, daemon=True)
+            thread = threading.Thread(target=method, name=f"{self.__class__.__name__}.{method.__name__}", daemon=True)
             self.threads.append(thread)
+            Component.running_threads.add(thread)
             # Start the thread
             thread.start()
 
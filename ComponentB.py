@@ -16,6 +16,9 @@ class ComponentB(Component):
     - receiver: Listens to ComponentA, forwards to ComponentC, handles responses
     """
 
+    # Seconds to wait for ComponentC's reply before giving up on a message
+    FORWARD_TIMEOUT = 5.0
+
     def __init__(self, **connections: ConnectionInterface) -> None:
         """
         Initialize ComponentB with connections.
@@ -41,7 +44,8 @@ class ComponentB(Component):
         Flow:
         1. Listens on connection_in for messages from ComponentA (already serialized)
         2. Forwards data as-is to ComponentC (no serialization/deserialization)
-        3. Receives response and returns it as-is
+        3. Receives response and returns it as-is, or gives up after FORWARD_TIMEOUT seconds
+           (or earlier, if the incoming message carries an earlier deadline)
         """
         def message_handler(data: str) -> str:
             Log.send(f"received: {data}", self.log_connection)
@@ -49,7 +53,11 @@ class ComponentB(Component):
             # Forward the data to ComponentC and get response (bidirectional connection)
             if 'connection_forward' in self.connections:
                 Log.send(f"forwards: {data}", self.log_connection)
-                response = self.connections['connection_forward'].send(data)
+                try:
+                    response = self.connections['connection_forward'].send(data, timeout=self.FORWARD_TIMEOUT)
+                except TimeoutError:
+                    Log.send(f"timed out: {data}", self.log_connection)
+                    return ""
                 Log.send(f"received: {response}", self.log_connection)
                 return response
             
@@ -3,6 +3,20 @@ from ConnectionInterface import ConnectionInterface
 from Log import Log
 
 
+def echo(data: str) -> str:
+    """
+    Reply of ComponentWeb to a web message: the message itself.
+    Module-level so it can run in the worker processes of a FastAPI connection with workers > 0.
+    
+    Args:
+        data: The received message.
+        
+    Returns:
+        The message as-is.
+    """
+    return data
+
+
 class ComponentWeb(Component):
     """
     Web component that listens to incoming messages via FastAPI connection
@@ -13,6 +27,9 @@ class ComponentWeb(Component):
     
     Methods:
     - receiver: Listens to FastAPI connection and echoes received messages
+    
+    If the web connection offloads its handler to worker processes (workers > 0), echo() runs there
+    directly and the messages are not logged, since workers cannot reach the log connection.
     """
 
     def __init__(self, **connections: ConnectionInterface) -> None:
@@ -43,11 +60,18 @@ class ComponentWeb(Component):
         2. Logs the received message with timestamp
         3. Returns the message as-is (echo behavior)
         """
+        web_connection = self.connections['web_connection']
+        if getattr(web_connection, 'workers', 0) > 0:
+            # Offloaded handlers must be picklable, closures over self are not
+            web_connection.listen(echo)
+            return
+        
         def message_handler(data: str) -> str:
             Log.send(f"received from web: {data}", self.log_connection)
             
             # Echo the message back to the web frontend
-            Log.send(f"responding: {data}", self.log_connection)
-            return data
+            reply = echo(data)
+            Log.send(f"responding: {reply}", self.log_connection)
+            return reply
         
-        self.connections['web_connection'].listen(message_handler)
+        web_connection.listen(message_handler)
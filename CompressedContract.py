@@ -0,0 +1,204 @@
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, Optional, Union
+from DataContract import DataContract
+
+
+class CompressedContract(DataContract):
+    """
+    Data contract wrapper that compresses the output of another contract with zlib.
+
+    Payloads smaller than `threshold` bytes, or that do not shrink, are passed through unchanged.
+    Compressed payloads are returned as bytes frames starting with a marker, so deserialize()
+    can tell them apart from plain payloads:
+
+        b'\\x1fCZ' + kind (1 byte) [+ dictionary id (4 bytes)] + body
+
+    where kind is 0 for a stored (uncompressed) bytes payload, 1 for zlib and 2 for zlib with a
+    preset dictionary, with the high bit set when the wrapped contract produced bytes instead of str.
+    A dictionary trained on typical messages makes small repetitive payloads compressible; frames
+    carry the dictionary id so older dictionaries stay decodable after retraining.
+
+    Example:
+        contract = CompressedContract(Message(), threshold=64)
+        contract.train(["Message 1", "Message 2", "Message 3"])
+        frame = contract.serialize(42)       # str or compressed bytes
+        value = contract.deserialize(frame)  # 42
+        contract.stats()                     # {'ratio': 2.1, 'compress_seconds': ..., ...}
+    """
+
+    MAGIC = b'\x1fCZ'
+    STORED = 0
+    ZLIB = 1
+    ZLIB_DICT = 2
+    BYTES = 0x80
+
+    def __init__(self, contract: DataContract, threshold: int = 256, level: int = 6, encoding: str = 'utf-8') -> None:
+        """
+        Initialize the CompressedContract.
+
+        Args:
+            contract: The contract whose serialized output is compressed.
+            threshold: Minimum payload size in bytes to attempt compression. Defaults to 256.
+            level: zlib compression level from 1 (fastest) to 9 (smallest). Defaults to 6.
+            encoding: Encoding used to turn str payloads into bytes. Defaults to 'utf-8'.
+        """
+        self.contract = contract
+        self.threshold = threshold
+        self.level = level
+        self.encoding = encoding
+
+        self._dictionary: Optional[bytes] = None
+        self._dictionary_id: int = 0
+        self._dictionaries: Dict[int, bytes] = {}
+
+        self._lock = threading.Lock()
+        self._frames = 0
+        self._compressed_frames = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._compress_seconds = 0.0
+        self._decompress_seconds = 0.0
+
+    def train(self, samples: Iterable[Union[str, bytes]], size: int = 32768) -> int:
+        """
+        Build a preset dictionary from typical serialized payloads.
+
+        The most frequent samples are placed at the end of the dictionary, where zlib finds them cheapest.
+
+        Args:
+            samples: Serialized payloads representative of the traffic.
+            size: Maximum dictionary size in bytes, zlib uses at most 32768. Defaults to 32768.
+
+        Returns:
+            The id of the new dictionary, carried in every frame compressed with it.
+
+        Raises:
+            ValueError: If no non-empty samples are given.
+        """
+        counts = Counter(sample.encode(self.encoding) if isinstance(sample, str) else sample for sample in samples)
+        counts.pop(b'', None)
+        if not counts:
+            raise ValueError("At least one non-empty sample is required to train a dictionary")
+
+        # Least common first, so the most common samples end up closest to the data
+        dictionary = b''.join(sample for sample, _ in reversed(counts.most_common()))[-size:]
+        dictionary_id = zlib.crc32(dictionary)
+
+        with self._lock:
+            self._dictionaries[dictionary_id] = dictionary
+            self._dictionary = dictionary
+            self._dictionary_id = dictionary_id
+        return dictionary_id
+
+    def serialize(self, data: any) -> Union[str, bytes]:
+        """
+        Serialize data with the wrapped contract and compress the result if it is large enough.
+
+        Args:
+            data: The data to serialize with the wrapped contract.
+
+        Returns:
+            The wrapped contract's output if it was not compressed, otherwise a compressed bytes frame.
+        """
+        payload = self.contract.serialize(data)
+        is_bytes = isinstance(payload, bytes)
+        raw = payload if is_bytes else payload.encode(self.encoding)
+
+        frame = None
+        elapsed = 0.0
+        if len(raw) >= self.threshold:
+            start = time.thread_time()
+            dictionary, dictionary_id = self._dictionary, self._dictionary_id
+            if dictionary is not None:
+                compressor = zlib.compressobj(self.level, zdict=dictionary)
+                body = compressor.compress(raw) + compressor.flush()
+                header = self.MAGIC + struct.pack('>BI', self.ZLIB_DICT | (self.BYTES if is_bytes else 0), dictionary_id)
+            else:
+                body = zlib.compress(raw, self.level)
+                header = self.MAGIC + bytes((self.ZLIB | (self.BYTES if is_bytes else 0),))
+            elapsed = time.thread_time() - start
+            if len(header) + len(body) < len(raw):
+                frame = header + body
+
+        if frame is None and is_bytes:
+            # Bytes payloads are always framed, so they can't be mistaken for a compressed frame
+            frame = self.MAGIC + bytes((self.STORED | self.BYTES,)) + payload
+
+        with self._lock:
+            self._frames += 1
+            self._bytes_in += len(raw)
+            self._bytes_out += len(raw) if frame is None else len(frame)
+            self._compress_seconds += elapsed
+            if frame is not None and frame[len(self.MAGIC)] & ~self.BYTES != self.STORED:
+                self._compressed_frames += 1
+
+        return payload if frame is None else frame
+
+    def deserialize(self, data: Union[str, bytes]) -> any:
+        """
+        Decompress a frame if needed and deserialize it with the wrapped contract.
+
+        Args:
+            data: A plain payload or a compressed frame produced by serialize().
+
+        Returns:
+            The data deserialized by the wrapped contract.
+
+        Raises:
+            ValueError: If the frame is malformed or was compressed with an unknown dictionary.
+        """
+        if not isinstance(data, bytes):
+            return self.contract.deserialize(data)
+        if not data.startswith(self.MAGIC) or len(data) <= len(self.MAGIC):
+            raise ValueError("Bytes payload is not a CompressedContract frame")
+
+        kind = data[len(self.MAGIC)] & ~self.BYTES
+        is_bytes = bool(data[len(self.MAGIC)] & self.BYTES)
+        body_start = len(self.MAGIC) + 1
+        if kind == self.STORED:
+            return self.contract.deserialize(data[body_start:])
+
+        start = time.thread_time()
+        try:
+            if kind == self.ZLIB:
+                raw = zlib.decompress(data[body_start:])
+            elif kind == self.ZLIB_DICT:
+                (dictionary_id,) = struct.unpack_from('>I', data, body_start)
+                dictionary = self._dictionaries.get(dictionary_id)
+                if dictionary is None:
+                    raise ValueError(f"Frame was compressed with unknown dictionary {dictionary_id:#010x}")
+                decompressor = zlib.decompressobj(zdict=dictionary)
+                raw = decompressor.decompress(data[body_start + 4:]) + decompressor.flush()
+            else:
+                raise ValueError(f"Unknown frame kind: {kind}")
+        except (zlib.error, struct.error) as e:
+            raise ValueError(f"Corrupt compressed frame: {e}") from e
+        elapsed = time.thread_time() - start
+
+        with self._lock:
+            self._decompress_seconds += elapsed
+
+        return self.contract.deserialize(raw if is_bytes else raw.decode(self.encoding))
+
+    def stats(self) -> dict:
+        """
+        Return compression statistics since creation.
+
+        Returns:
+            A dict with 'frames', 'compressed_frames', 'bytes_in', 'bytes_out', 'ratio' (bytes_in / bytes_out)
+            and the thread CPU time spent in 'compress_seconds' and 'decompress_seconds'.
+        """
+        with self._lock:
+            return {
+                'frames': self._frames,
+                'compressed_frames': self._compressed_frames,
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+                'ratio': self._bytes_in / self._bytes_out if self._bytes_out else 1.0,
+                'compress_seconds': self._compress_seconds,
+                'decompress_seconds': self._decompress_seconds,
+            }
@@ -9,16 +9,27 @@ class Connection:
     The connection type is determined at initialization.
     """
 
-    def __new__(cls, connection_type: Literal['queue', 'fastapi'] = 'queue', bidirectional: bool = True, contract=None, port: int = 5000, handler_id: str = None) -> ConnectionInterface:
+    def __new__(cls, connection_type: Literal['queue', 'priority', 'spsc', 'broadcast', 'sharded', 'fastapi'] = 'queue', bidirectional: bool = True, contract=None, port: int = 5000, handler_id: str = None, lanes: int = 3, starvation_limit: int = 16, cache=None, workers: int = 0, request_timeout: float = None, warm_up: bool = True, capacity: int = 1024, slow_subscriber: str = 'block', strategy: str = 'round_robin', key=None, hedge_after: float = None) -> ConnectionInterface:
         """
         Create and return a connection of the specified type.
         
         Args:
-            connection_type: The type of connection to create. Options: 'queue', 'fastapi'. Defaults to 'queue'.
+            connection_type: The type of connection to create. Options: 'queue', 'priority', 'spsc', 'broadcast', 'sharded', 'fastapi'. Defaults to 'queue'.
             bidirectional: Whether messages are replied to the sender. Defaults to True.
             contract: Optional DataContract for serialization/deserialization. Defaults to None.
             port: Port for fastapi connections. Defaults to 5000.
             handler_id: Unique identifier for fastapi handler. Defaults to None.
+            lanes: Number of priority lanes for priority connections. Defaults to 3.
+            starvation_limit: Times a non-empty lane may be skipped for priority connections. Defaults to 16.
+            cache: Optional HandlerCache wrapped around handlers passed to listen(). Defaults to None.
+            workers: Worker processes to run fastapi handlers in, 0 to run them in-process. Defaults to 0.
+            request_timeout: Seconds before a fastapi request replies 504. Defaults to None (no limit).
+            warm_up: Whether to start the fastapi worker processes before the first request. Defaults to True.
+            capacity: Ring buffer size of broadcast connections. Defaults to 1024.
+            slow_subscriber: Broadcast policy for lagging subscribers: 'block', 'skip' or 'disconnect'. Defaults to 'block'.
+            strategy: Replica choice of sharded connections: 'round_robin', 'least_loaded' or 'hash'. Defaults to 'round_robin'.
+            key: Optional function extracting the sharding key from sent data for the 'hash' strategy. Defaults to None.
+            hedge_after: Seconds before a sharded request is also sent to a second replica. Defaults to None (no hedging).
         
         Returns:
             A ConnectionInterface instance of the specified type.
@@ -27,9 +38,21 @@ class Connection:
             ValueError: If the connection type is not supported.
         """
         if connection_type == 'queue':
-            return QueueConnection(bidirectional, contract)
+            return QueueConnection(bidirectional, contract, cache)
+        elif connection_type == 'priority':
+            from PriorityQueueConnection import PriorityQueueConnection
+            return PriorityQueueConnection(bidirectional, contract, lanes, starvation_limit, cache)
+        elif connection_type == 'spsc':
+            from SPSCConnection import SPSCConnection
+            return SPSCConnection(bidirectional, contract, cache)
+        elif connection_type == 'broadcast':
+            from BroadcastConnection import BroadcastConnection
+            return BroadcastConnection(bidirectional, contract, cache, capacity, slow_subscriber)
+        elif connection_type == 'sharded':
+            from ShardedConnection import ShardedConnection
+            return ShardedConnection(bidirectional, contract, cache, strategy, key, hedge_after=hedge_after)
         elif connection_type == 'fastapi':
             from FastAPIConnection import FastAPIConnection
-            return FastAPIConnection(bidirectional, contract, port, handler_id)
+            return FastAPIConnection(bidirectional, contract, port, handler_id, cache, workers, request_timeout, warm_up)
         else:
-            raise ValueError(f"Unsupported connection type: {connection_type}. Supported types: 'queue', 'fastapi'")
+            raise ValueError(f"Unsupported connection type: {connection_type}. Supported types: 'queue', 'priority', 'spsc', 'broadcast', 'sharded', 'fastapi'")
@@ -1,19 +1,49 @@
+import inspect
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Callable, Optional
 from DataContract import DataContract
 
 class ConnectionInterface(ABC):
     """Abstract base class for handling connections between components."""
 
-    def __init__(self, bidirectional: bool, contract: DataContract = None) -> None:
+    # Name of the handler each listening thread passed to listen(), or that a dispatching thread such as
+    # the FastAPI server is running right now, used by the Profiler
+    listening_handlers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def __init__(self, bidirectional: bool, contract: DataContract = None, cache=None) -> None:
         """Initialize the Connection.
         
         Args:
             bidirectional: Whether messages are replied to the sender.
             contract: Optional DataContract for serialization/deserialization.
+            cache: Optional HandlerCache wrapped around handlers passed to listen().
         """
         self.bidirectional = bidirectional
         self.contract = contract
+        self.cache = cache
+
+    def _wrap_handler(self, handler: Callable[[str], str]) -> Callable[[str], str]:
+        """
+        Wrap a handler passed to listen() with the connection's cache, if any. Cached replies are
+        shared by all handlers on this connection created from the same function definition.
+        Must be called from the listening thread, which is recorded as running this handler.
+        
+        Args:
+            handler: The handler passed to listen().
+            
+        Returns:
+            The cached handler, or the handler itself if the connection has no cache.
+        """
+        name = getattr(handler, '__name__', type(handler).__name__)
+        ConnectionInterface.listening_handlers[threading.current_thread()] = name
+        if self.cache is None:
+            return handler
+        # Key on the handler's code, not the handler object: every listen() call passes a new closure,
+        # and replicas of a component listening on this connection should share entries
+        code = getattr(inspect.unwrap(handler), '__code__', handler)
+        return self.cache.wrap(handler, namespace=(self, code))
 
     @abstractmethod
     def listen(self, handler: Callable[[str], str]) -> None:
@@ -26,12 +56,16 @@ class ConnectionInterface(ABC):
         pass
 
     @abstractmethod
-    def send(self, data: str) -> str:
+    def send(self, data: str, priority: int = 0, timeout: Optional[float] = None) -> str:
         """
         Abstract method to send data through the connection.
         
         Args:
             data: The data to be sent as a string.
+            priority: Priority lane for the data, higher is served first.
+                      Connections without priority lanes ignore it.
+            timeout: Seconds before the send gives up with a TimeoutError. The deadline of the
+                     request being handled by the calling thread (see Deadline) also applies.
 
         Returns:
             The data that was sent as a string.
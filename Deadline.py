@@ -0,0 +1,81 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class Deadline:
+    """
+    Per-thread deadline of the request currently being handled.
+
+    Connections set the deadline that came with a request while its handler runs, and bidirectional
+    send() calls use it on top of their own timeout. A component that forwards a request therefore
+    gives up when the original sender would, without passing timeouts around explicitly.
+    Unidirectional sends don't inherit it: nobody waits for their reply.
+    Deadlines are absolute time.monotonic() values; None means no deadline.
+
+    Example:
+        def message_handler(data: str) -> str:
+            # Raises TimeoutError once the deadline of the request being handled has passed
+            return self.connections['connection_forward'].send(data)
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def current(cls) -> Optional[float]:
+        """
+        Return the deadline of the request handled by the calling thread, or None.
+        """
+        return getattr(cls._local, 'deadline', None)
+
+    @classmethod
+    def resolve(cls, timeout: Optional[float] = None, inherit: bool = True) -> Optional[float]:
+        """
+        Combine a timeout with the current deadline.
+
+        Args:
+            timeout: Seconds from now, or None for no timeout of its own.
+            inherit: Whether the current deadline applies. Fire-and-forget sends pass False: nobody
+                     waits for them, so the request being handled should not expire them. Defaults to True.
+
+        Returns:
+            The earlier of now + timeout and the current deadline, or None if neither is set.
+        """
+        deadline = cls.current() if inherit else None
+        if timeout is not None:
+            own = time.monotonic() + timeout
+            deadline = own if deadline is None else min(deadline, own)
+        return deadline
+
+    @staticmethod
+    def remaining(deadline: Optional[float]) -> Optional[float]:
+        """
+        Return the seconds left until a deadline (at least 0), or None if there is no deadline.
+        """
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    @staticmethod
+    def expired(deadline: Optional[float]) -> bool:
+        """
+        Return whether a deadline has passed. A None deadline never expires.
+        """
+        return deadline is not None and time.monotonic() >= deadline
+
+    @classmethod
+    @contextmanager
+    def scope(cls, deadline: Optional[float]) -> Iterator[None]:
+        """
+        Make deadline the current deadline of the calling thread within a with-block.
+
+        Args:
+            deadline: Absolute time.monotonic() deadline, or None for no deadline.
+        """
+        previous = cls.current()
+        cls._local.deadline = deadline
+        try:
+            yield
+        finally:
+            cls._local.deadline = previous
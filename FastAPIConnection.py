@@ -1,9 +1,19 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Callable, Optional
-from threading import Thread
+from threading import Thread, Lock, current_thread
+import asyncio
+import functools
+import multiprocessing
+import os
+import pickle
+import time
 import uvicorn
 from ConnectionInterface import ConnectionInterface
+from Deadline import Deadline
+from Profiler import Profiler
 
 
 class FastAPIConnection(ConnectionInterface):
@@ -11,14 +21,24 @@ class FastAPIConnection(ConnectionInterface):
     FastAPI implementation of ConnectionInterface for HTTP-based communication.
     Uses a singleton pattern to ensure the server starts only once.
     Assumes the opposite endpoint is handled by a webpage client.
+    
+    With workers > 0 the handler runs in a shared pool of worker processes instead of the server's
+    event loop, so CPU-bound handlers scale with cores instead of sharing the main process' GIL.
+    Offloaded handlers must be picklable (a module-level function, not a closure) and run without
+    access to the main process' connections, e.g. they cannot use Log.send. All offloading connections
+    share one pool, so they must ask for the same number of workers.
     """
     
     _instance: Optional['FastAPIConnection'] = None
     _app: Optional[FastAPI] = None
     _server_thread: Optional[Thread] = None
     _handlers: dict = {}
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_workers: int = 0
+    _pool_lock: Lock = Lock()
     
-    def __new__(cls, bidirectional: bool = True, contract=None, port: int = 5000, handler_id: str = None):
+    def __new__(cls, bidirectional: bool = True, contract=None, port: int = 5000, handler_id: str = None, cache=None,
+                workers: int = 0, request_timeout: Optional[float] = None, warm_up: bool = True):
         """
         Singleton pattern to ensure only one FastAPI server instance.
         
@@ -27,6 +47,11 @@ class FastAPIConnection(ConnectionInterface):
             contract: Optional DataContract for serialization/deserialization.
             port: Port to run the FastAPI server on. Defaults to 5000.
             handler_id: Unique identifier for this handler.
+            cache: Optional HandlerCache wrapped around handlers passed to listen().
+            workers: Number of worker processes to run the handler in, 0 to run it in-process. Defaults to 0.
+            request_timeout: Seconds before a request gives up with 504, None to wait forever. In-process
+                             handlers get it as their Deadline, offloaded handlers are waited for this long.
+            warm_up: Whether to start all worker processes before the first request. Defaults to True.
         """
         if cls._instance is None:
             instance = super().__new__(cls)
@@ -34,7 +59,8 @@ class FastAPIConnection(ConnectionInterface):
             instance._init_app(port)
         return cls._instance
     
-    def __init__(self, bidirectional: bool = True, contract=None, port: int = 5000, handler_id: str = None):
+    def __init__(self, bidirectional: bool = True, contract=None, port: int = 5000, handler_id: str = None, cache=None,
+                 workers: int = 0, request_timeout: Optional[float] = None, warm_up: bool = True):
         """
         Initialize the FastAPIConnection.
         
@@ -43,10 +69,76 @@ class FastAPIConnection(ConnectionInterface):
             contract: Optional DataContract for serialization/deserialization.
             port: Port to run the FastAPI server on.
             handler_id: Unique identifier for this handler.
+            cache: Optional HandlerCache wrapped around handlers passed to listen().
+            workers: Number of worker processes to run the handler in, 0 to run it in-process. Defaults to 0.
+            request_timeout: Seconds before a request gives up with 504, None to wait forever. In-process
+                             handlers get it as their Deadline, offloaded handlers are waited for this long.
+            warm_up: Whether to start all worker processes before the first request. Defaults to True.
         """
-        super().__init__(bidirectional, contract)
+        super().__init__(bidirectional, contract, cache)
         self.port = port
         self.handler_id = handler_id or "default"
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.warm_up = warm_up
+    
+    @classmethod
+    def _get_pool(cls, workers: int, warm_up: bool) -> ProcessPoolExecutor:
+        """
+        Return the shared worker process pool, creating it on first use.
+        The pool size is set by the first connection that offloads its handler.
+        
+        Args:
+            workers: Number of worker processes.
+            warm_up: Whether to start all worker processes now instead of on the first requests.
+            
+        Raises:
+            ValueError: If the pool already exists with a different number of workers.
+        """
+        with cls._pool_lock:
+            if cls._pool is not None and workers != cls._pool_workers:
+                raise ValueError(f"Worker process pool already runs {cls._pool_workers} workers, got workers={workers}. "
+                                 f"All offloading connections share one pool and must use the same value")
+            if cls._pool is None:
+                # Spawn instead of fork: forking a process that runs uvicorn and component threads is unsafe
+                cls._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                cls._pool_workers = workers
+                if warm_up:
+                    # Each task blocks briefly so they can't all land on the first worker that starts
+                    for future in [cls._pool.submit(_warm_up_worker) for _ in range(workers)]:
+                        future.result()
+            return cls._pool
+    
+    @classmethod
+    def shutdown_pool(cls) -> None:
+        """
+        Shut down the worker process pool, if any. Offloaded handlers fail until a new pool is created.
+        """
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    
+    @classmethod
+    def _run_in_pool(cls, handler: Callable[[str], str], timeout: Optional[float], data: str) -> str:
+        """
+        Run a handler in a worker process and wait for its reply.
+        Called from a thread of the event loop's default executor, not from the event loop itself.
+        
+        Raises:
+            RuntimeError: If the pool has been shut down.
+            TimeoutError: If the reply does not arrive within timeout seconds.
+        """
+        pool = cls._pool
+        if pool is None:
+            raise RuntimeError("Worker process pool has been shut down")
+        future = pool.submit(handler, data)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # Drop the request if it has not started yet, a running one finishes in its worker
+            future.cancel()
+            raise
     
     @classmethod
     def _init_app(cls, port: int = 5000):
@@ -76,11 +168,22 @@ class FastAPIConnection(ConnectionInterface):
             
             # Get the first registered handler
             handler_id = list(cls._handlers.keys())[0]
-            handler, bidirectional = cls._handlers[handler_id]
+            handler, bidirectional, offloaded, request_timeout = cls._handlers[handler_id]
             
             try:
-                # Call the handler directly with the message
-                reply = handler(str(request_data))
+                if offloaded:
+                    # Wait for the worker process in a thread so the event loop keeps serving requests
+                    reply = await asyncio.get_running_loop().run_in_executor(None, handler, str(request_data))
+                else:
+                    # Call the handler directly with the message, its sends inherit the request timeout.
+                    # The server thread is no component thread, so tell the Profiler what it is running
+                    server_thread = current_thread()
+                    ConnectionInterface.listening_handlers[server_thread] = getattr(handler, '__name__', type(handler).__name__)
+                    try:
+                        with Deadline.scope(Deadline.resolve(request_timeout)):
+                            reply = handler(str(request_data))
+                    finally:
+                        ConnectionInterface.listening_handlers.pop(server_thread, None)
                 
                 # Only return a response if bidirectional is True
                 if bidirectional and reply:
@@ -90,17 +193,61 @@ class FastAPIConnection(ConnectionInterface):
                 else:
                     # Unidirectional: process message but don't send response
                     return {"status": "received"}
+            except (TimeoutError, FutureTimeoutError):
+                raise HTTPException(status_code=504, detail="Handler did not reply in time")
             except Exception as e:
                 return {"status": "error", "error": str(e)}
         
+        @cls._app.get("/api/profiler")
+        async def profiler_status():
+            """
+            Return the profiler status and the samples aggregated per component thread and handler.
+            """
+            profiler = Profiler()
+            return {**profiler.status(), "summary": profiler.summary()}
+        
+        @cls._app.post("/api/profiler/start")
+        async def profiler_start(interval: float = 0.01):
+            """
+            Start sampling component threads every `interval` seconds.
+            """
+            try:
+                Profiler().start(interval)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return Profiler().status()
+        
+        @cls._app.post("/api/profiler/stop")
+        async def profiler_stop():
+            """
+            Stop sampling, keeping the collected samples.
+            """
+            Profiler().stop()
+            return Profiler().status()
+        
+        @cls._app.post("/api/profiler/reset")
+        async def profiler_reset():
+            """
+            Discard all collected samples.
+            """
+            Profiler().reset()
+            return Profiler().status()
+        
+        @cls._app.get("/api/profiler/collapsed", response_class=PlainTextResponse)
+        async def profiler_collapsed():
+            """
+            Export the samples in collapsed-stack format for flamegraph tools.
+            """
+            return Profiler().collapsed()
+        
         # Start the server in a background thread
         cls._server_thread = Thread(
             target=lambda: uvicorn.run(cls._app, host="127.0.0.1", port=port, log_level="error"),
+            name="FastAPIConnection.server",
             daemon=True
         )
         cls._server_thread.start()
         
-        import time
         time.sleep(1)  # Give server time to start
     
     def listen(self, handler: Callable[[str], str]) -> None:
@@ -110,17 +257,33 @@ class FastAPIConnection(ConnectionInterface):
         
         Args:
             handler: A callable function to process incoming data.
+            
+        Raises:
+            TypeError: If the connection offloads to worker processes and the handler is not picklable.
+            ValueError: If another connection already started the worker pool with a different number of workers.
         """
-        # Register the handler with its bidirectional flag
-        FastAPIConnection._handlers[self.handler_id] = (handler, self.bidirectional)
+        offloaded = self.workers > 0
+        if offloaded:
+            try:
+                pickle.dumps(handler)
+            except Exception as e:
+                raise TypeError(f"Handlers run in worker processes must be picklable module-level functions: {e}") from e
+            FastAPIConnection._get_pool(self.workers, self.warm_up)
+            # The cache wraps the offloaded call, so hits and coalesced requests never reach a worker
+            handler = functools.update_wrapper(functools.partial(FastAPIConnection._run_in_pool, handler, self.request_timeout), handler)
+        
+        # Register the handler with its bidirectional and offload flags
+        FastAPIConnection._handlers[self.handler_id] = (self._wrap_handler(handler), self.bidirectional, offloaded, self.request_timeout)
     
-    def send(self, data: str) -> str:
+    def send(self, data: str, priority: int = 0, timeout: Optional[float] = None) -> str:
         """
         Send data. Since the opposite endpoint is the web client (which initiates requests),
         this method stores the data for the next request from the client.
         
         Args:
             data: The data to be sent as a string.
+            priority: Ignored, HTTP requests are served as they arrive.
+            timeout: Ignored, the data is not delivered actively.
             
         Returns:
             The sent data.
@@ -129,3 +292,10 @@ class FastAPIConnection(ConnectionInterface):
         # The client (webpage) makes requests and receives responses from handlers
         return data
 
+
+def _warm_up_worker() -> int:
+    """
+    Task submitted to every worker process at pool creation so they are started before the first request.
+    """
+    time.sleep(0.1)
+    return os.getpid()
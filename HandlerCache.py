@@ -0,0 +1,198 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight:
+    """
+    A handler execution in progress that concurrent identical requests wait for.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class HandlerCache:
+    """
+    Opt-in result cache for handlers registered via a connection's listen().
+
+    Replies are stored in an LRU keyed by (namespace, data) with a time-to-live and bounds on the
+    number of entries and their approximate memory size. Connections wrap their listen() handlers
+    with a namespace of the connection and the handler's code object, so replicas of a component
+    listening on the same connection share entries while different handlers never do. Concurrent identical requests in a namespace are
+    coalesced: only the first runs the handler, the others wait for and share its reply
+    (or its exception). Payloads that are not hashable bypass the cache.
+
+    Only cache handlers whose reply depends on the payload alone: on a hit the handler is not
+    called, so its side effects (logging, forwarding) are skipped as well.
+
+    Example:
+        cache = HandlerCache(max_entries=1000, ttl=30.0)
+        web_connection = Connection('fastapi', port=5000, handler_id="web_handler", cache=cache)
+        ...
+        cache.stats()  # {'hits': 12, 'misses': 3, 'coalesced': 1, 'evictions': 0, ...}
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 60.0, max_bytes: int = 16 * 1024 * 1024) -> None:
+        """
+        Initialize the HandlerCache.
+
+        Args:
+            max_entries: Maximum number of cached replies. Defaults to 1024.
+            ttl: Seconds a reply stays valid, None to never expire. Defaults to 60.
+            max_bytes: Maximum approximate size of the cached payloads and replies. Defaults to 16 MiB.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[Hashable, Hashable], Tuple[Any, float, int]]' = OrderedDict()
+        self._in_flight: Dict[Tuple[Hashable, Hashable], _Flight] = {}
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __call__(self, handler: Callable[[str], str]) -> Callable[[str], str]:
+        """
+        Decorator form of wrap().
+        """
+        return self.wrap(handler)
+
+    def wrap(self, handler: Callable[[str], str], namespace: Hashable = None) -> Callable[[str], str]:
+        """
+        Wrap a handler so its replies are cached and concurrent identical calls are coalesced.
+
+        Args:
+            handler: The handler to wrap.
+            namespace: Hashable identifying the handler in cache keys. Handlers wrapped with the same
+                       namespace share entries. Defaults to None, which uses the handler itself.
+
+        Returns:
+            A callable with the same signature as the handler.
+        """
+        if namespace is None:
+            namespace = handler
+
+        def cached_handler(data: str) -> str:
+            return self.call(handler, data, namespace)
+
+        cached_handler.__name__ = getattr(handler, '__name__', 'cached_handler')
+        return cached_handler
+
+    def call(self, handler: Callable[[str], str], data: str, namespace: Hashable = None) -> str:
+        """
+        Return the cached reply of handler for data, running the handler on a miss.
+
+        Args:
+            handler: The handler to call on a miss.
+            data: The payload passed to the handler.
+            namespace: Hashable identifying the handler in cache keys. Defaults to None, which uses the handler itself.
+
+        Returns:
+            The handler's reply.
+        """
+        try:
+            key = (handler if namespace is None else namespace, data)
+            hash(key)
+        except TypeError:
+            return handler(data)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                reply, expires_at, size = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return reply
+                self._remove(key)
+                self._expirations += 1
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                flight = self._in_flight[key] = _Flight()
+                self._misses += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = handler(data)
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._store(key, flight.result)
+            return flight.result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def _store(self, key: Tuple[Hashable, Hashable], reply: Any) -> None:
+        """
+        Insert a reply and evict least recently used entries until the bounds hold.
+        """
+        size = sys.getsizeof(key[1]) + sys.getsizeof(reply)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float('inf')
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (reply, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: Tuple[Hashable, Hashable]) -> None:
+        """
+        Remove an entry. Must be called with the lock held.
+        """
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        """
+        Remove all cached replies. Statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return cache statistics.
+
+        Returns:
+            A dict with 'hits', 'misses', 'coalesced' (calls that waited for an identical call in flight),
+            'evictions', 'expirations', 'entries' and 'bytes'.
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'coalesced': self._coalesced,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
@@ -1,7 +1,12 @@
 from Component import Component
 from ConnectionInterface import ConnectionInterface
-import inspect
+from collections import deque
 from datetime import datetime
+from typing import Dict, List, Tuple
+import heapq
+import inspect
+import threading
+import time
 
 
 class Log(Component):
@@ -11,11 +16,34 @@ class Log(Component):
     Provides a static send() method for components to log messages with automatic component and method name detection.
     Supports full call stack tracking to show parent methods in the log output.
     
+    send() does not touch the log connection: it appends to a buffer owned by the calling thread, which
+    needs no lock. The flusher periodically collects the buffers of all threads, merges them by timestamp
+    and sends them to the listener as one batch, so logging threads don't contend on the connection.
+    Messages younger than FLUSH_GRACE are held back until the next flush, so a message stamped just
+    before a flush but appended just after it is still printed in timestamp order.
+    
     Methods:
-    - listener: Listens to incoming log messages and prints them
+    - listener: Listens to incoming log messages (single messages or batches) and prints them
+    - flusher: Periodically sends the buffered messages of all threads to the listener
     - send (static): Static method for components to send log messages
+    - flush (static): Sends the buffered messages for a log connection
     """
 
+    # Seconds between flushes of the per-thread buffers
+    FLUSH_INTERVAL = 0.05
+    # Messages younger than this many seconds wait for the next flush
+    FLUSH_GRACE = 0.01
+
+    # Per-thread buffers, keyed by id() of the log connection
+    _local = threading.local()
+    # All buffers per log connection, registered once per thread under _registry_lock
+    _buffers: Dict[int, List[Tuple[threading.Thread, deque]]] = {}
+    # Messages held back by the grace period, per log connection (heap of (timestamp, message))
+    _held: Dict[int, List[Tuple[int, str]]] = {}
+    _registry_lock = threading.Lock()
+    # Serializes flushes, so batches of one connection are sent in timestamp order
+    _flush_lock = threading.Lock()
+
     def __init__(self, **connections: ConnectionInterface) -> None:
         """
         Initialize Log with connections.
@@ -28,21 +56,95 @@ class Log(Component):
             component = Log(connection_log=conn_log)
         """
         super().__init__(**connections)
+        self._stopping = threading.Event()
         
-        # Associate listener method
+        # Associate listener and flusher methods
         if 'connection_log' in connections:
             self.add_method(self.listener)
+            self.add_method(self.flusher)
 
     def listener(self) -> None:
         """
         Listener method that receives and logs all incoming messages.
         """
         def message_handler(data: str) -> str:
-            print(data)
+            if isinstance(data, list):
+                print('\n'.join(data))
+            else:
+                print(data)
             return ""
         
         self.connections['connection_log'].listen(message_handler)
 
+    def flusher(self) -> None:
+        """
+        Flusher method that sends the buffered messages of all threads every FLUSH_INTERVAL seconds.
+        """
+        while not self._stopping.wait(self.FLUSH_INTERVAL):
+            Log.flush(self.connections['connection_log'])
+
+    def stop(self) -> None:
+        """
+        Flush all buffered messages, let the listener print them and stop the threads.
+        """
+        connection_log = self.connections.get('connection_log')
+        if connection_log is not None:
+            self._stopping.set()
+            Log.flush(connection_log, final=True)
+            if hasattr(connection_log, 'stop_listening'):
+                connection_log.stop_listening()
+                for thread in self.threads:
+                    thread.join(timeout=1.0)
+        super().stop()
+
+    @staticmethod
+    def flush(connection_log: ConnectionInterface, final: bool = False) -> None:
+        """
+        Collect the buffered messages of all threads for a log connection and send them as one batch.
+        
+        Args:
+            connection_log: The log connection whose buffers to flush.
+            final: Whether to also send messages still within the grace period, e.g. at shutdown. Defaults to False.
+        """
+        key = id(connection_log)
+        with Log._flush_lock:
+            Log._flush(connection_log, key, final)
+
+    @staticmethod
+    def _flush(connection_log: ConnectionInterface, key: int, final: bool) -> None:
+        """
+        Body of flush(). Must be called with _flush_lock held.
+        """
+        with Log._registry_lock:
+            # Buffers of finished threads are dropped once they are empty
+            buffers = Log._buffers.get(key, [])
+            Log._buffers[key] = [(thread, buffer) for thread, buffer in buffers if thread.is_alive() or buffer]
+            buffers = [buffer for _, buffer in Log._buffers[key]]
+            held = Log._held.pop(key, [])
+
+        # Drain with popleft, which is safe against concurrent appends by the owning thread
+        drained = []
+        for buffer in buffers:
+            messages = []
+            while buffer:
+                messages.append(buffer.popleft())
+            drained.append(messages)
+
+        cutoff = float('inf') if final else time.time_ns() - int(Log.FLUSH_GRACE * 1e9)
+        batch = []
+        later = []
+        for timestamp, message in heapq.merge(held, *drained):
+            if timestamp <= cutoff:
+                batch.append(message)
+            else:
+                later.append((timestamp, message))
+
+        if later:
+            with Log._registry_lock:
+                Log._held[key] = later
+        if batch:
+            connection_log.send(batch)
+
     @staticmethod
     def send(message: str, connection_log: ConnectionInterface = None) -> None:
         """
@@ -51,6 +153,8 @@ class Log(Component):
         This static method can be called by other components to send log messages.
         The component name and method names are automatically deduced from the calling context.
         The message will be prefixed with the component name and the full method call chain.
+        The message is appended to the calling thread's buffer and reaches the connection with
+        the next flush by the Log component listening on it.
         
         Args:
             message: The message string to log.
@@ -97,7 +201,18 @@ class Log(Component):
         else:
             formatted_message = f"{component_name} - {message}"
         
-        # Add timestamp
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Format: YYYY-MM-DD HH:MM:SS.mmm
+        # Add timestamp, the same clock reading orders the buffered messages
+        now_ns = time.time_ns()
+        timestamp = datetime.fromtimestamp(now_ns / 1e9).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Format: YYYY-MM-DD HH:MM:SS.mmm
         formatted_message = f"[{timestamp}] {formatted_message}"        
-        connection_log.send(formatted_message)
+        
+        # Append to this thread's buffer for the connection, registering it on first use
+        buffers = getattr(Log._local, 'buffers', None)
+        if buffers is None:
+            buffers = Log._local.buffers = {}
+        buffer = buffers.get(id(connection_log))
+        if buffer is None:
+            buffer = buffers[id(connection_log)] = deque()
+            with Log._registry_lock:
+                Log._buffers.setdefault(id(connection_log), []).append((threading.current_thread(), buffer))
+        buffer.append((now_ns, formatted_message))
@@ -0,0 +1,179 @@
+from collections import deque
+from threading import Condition
+from typing import Any, Dict, List
+from QueueConnection import QueueConnection
+
+
+class PriorityLanes:
+    """
+    Queue with a fixed number of FIFO lanes, where higher lanes are served first.
+
+    Starvation protection: every time an item is served while a lower, non-empty lane
+    is passed over, that lane's skip counter increases. Once a lane has been skipped
+    starvation_limit times in a row, its oldest item is served next regardless of priority.
+    This bounds the wait of a lower lane to starvation_limit items per higher lane backlog.
+    """
+
+    def __init__(self, lanes: int = 3, starvation_limit: int = 16) -> None:
+        """
+        Initialize the PriorityLanes.
+
+        Args:
+            lanes: Number of priority lanes, lane 0 is the lowest. Defaults to 3.
+            starvation_limit: Number of times a non-empty lane may be skipped before it is served. Defaults to 16.
+
+        Raises:
+            ValueError: If lanes or starvation_limit is smaller than 1.
+        """
+        if lanes < 1:
+            raise ValueError(f"At least one lane is required, got {lanes}")
+        if starvation_limit < 1:
+            raise ValueError(f"starvation_limit must be at least 1, got {starvation_limit}")
+
+        self.lanes: List[deque] = [deque() for _ in range(lanes)]
+        self.starvation_limit = starvation_limit
+        self._skipped: List[int] = [0] * lanes
+        self._not_empty = Condition()
+
+        # Per-lane metrics
+        self._enqueued: List[int] = [0] * lanes
+        self._served: List[int] = [0] * lanes
+        self._max_depth: List[int] = [0] * lanes
+        self._promoted: List[int] = [0] * lanes
+
+    def put(self, item: Any, priority: int = 0) -> None:
+        """
+        Put an item at the end of its priority lane.
+
+        Args:
+            item: The item to queue.
+            priority: Lane index, 0 is the lowest and len(lanes) - 1 the highest. Defaults to 0.
+
+        Raises:
+            ValueError: If the priority is not a valid lane index.
+        """
+        if not 0 <= priority < len(self.lanes):
+            raise ValueError(f"Priority {priority} out of range, expected 0..{len(self.lanes) - 1}")
+
+        with self._not_empty:
+            lane = self.lanes[priority]
+            lane.append(item)
+            self._enqueued[priority] += 1
+            if len(lane) > self._max_depth[priority]:
+                self._max_depth[priority] = len(lane)
+            self._not_empty.notify()
+
+    def get(self) -> Any:
+        """
+        Remove and return the next item, blocking until one is available.
+
+        Returns:
+            The oldest item of a starving lane if any, otherwise of the highest non-empty lane.
+        """
+        with self._not_empty:
+            while not any(self.lanes):
+                self._not_empty.wait()
+
+            # Highest non-empty lane wins unless a lower lane has starved
+            chosen = max(index for index, lane in enumerate(self.lanes) if lane)
+            starving = max(range(len(self.lanes)), key=lambda index: self._skipped[index])
+            if self._skipped[starving] >= self.starvation_limit:
+                chosen = starving
+                self._promoted[chosen] += 1
+
+            # Every other non-empty lane below the chosen one has been passed over once more
+            for index in range(len(self.lanes)):
+                if index == chosen or not self.lanes[index]:
+                    self._skipped[index] = 0
+                elif index < chosen:
+                    self._skipped[index] += 1
+
+            self._served[chosen] += 1
+            return self.lanes[chosen].popleft()
+
+    def qsize(self) -> int:
+        """
+        Return the total number of queued items over all lanes.
+        """
+        with self._not_empty:
+            return sum(len(lane) for lane in self.lanes)
+
+    def lane_depths(self) -> List[int]:
+        """
+        Return the current number of queued items per lane, indexed by priority.
+        """
+        with self._not_empty:
+            return [len(lane) for lane in self.lanes]
+
+    def stats(self) -> List[Dict[str, int]]:
+        """
+        Return per-lane metrics, indexed by priority.
+
+        Returns:
+            A list of dicts with keys 'depth', 'max_depth', 'enqueued', 'served' and
+            'promoted' (times the lane was served by starvation protection).
+        """
+        with self._not_empty:
+            return [
+                {
+                    'depth': len(self.lanes[index]),
+                    'max_depth': self._max_depth[index],
+                    'enqueued': self._enqueued[index],
+                    'served': self._served[index],
+                    'promoted': self._promoted[index],
+                }
+                for index in range(len(self.lanes))
+            ]
+
+
+class PriorityQueueConnection(QueueConnection):
+    """
+    QueueConnection whose down queue is split into priority lanes.
+
+    send(data, priority=...) queues data in the given lane and the listener serves higher
+    lanes first, so urgent control messages do not wait behind a backlog of bulk messages.
+    On bidirectional connections each sender waits for the reply to its own request (see
+    QueueConnection), so reordering requests never hands a sender another request's reply.
+
+    Example:
+        connection = PriorityQueueConnection(bidirectional=False, lanes=3)
+        connection.send("bulk")                  # lane 0
+        connection.send("shutdown", priority=2)  # served before "bulk"
+    """
+
+    def __init__(self, bidirectional: bool = True, contract=None, lanes: int = 3, starvation_limit: int = 16, cache=None) -> None:
+        """
+        Initialize the PriorityQueueConnection.
+
+        Args:
+            bidirectional: Whether messages are replied to the sender. Defaults to True.
+            contract: Optional DataContract for serialization/deserialization. Defaults to None.
+            lanes: Number of priority lanes, priorities range from 0 to lanes - 1. Defaults to 3.
+            starvation_limit: Number of times a non-empty lane may be skipped before it is served. Defaults to 16.
+            cache: Optional HandlerCache wrapped around handlers passed to listen(). Defaults to None.
+        """
+        super().__init__(bidirectional, contract, cache)
+        self.down_queue: PriorityLanes = PriorityLanes(lanes, starvation_limit)
+        self.down_queue.name = "down_queue"
+
+    def _enqueue(self, request: tuple, priority: int) -> None:
+        """
+        Put a request in the priority lane requested by the sender.
+
+        Args:
+            request: The (data, deadline, request id) tuple to be queued.
+            priority: Lane index, 0 is the lowest.
+        """
+        self.down_queue.put(request, priority)
+
+    def lane_depths(self) -> List[int]:
+        """
+        Return the current number of queued messages per lane, indexed by priority.
+        """
+        return self.down_queue.lane_depths()
+
+    def stats(self) -> List[Dict[str, int]]:
+        """
+        Return per-lane metrics (depth, max_depth, enqueued, served, promoted), indexed by priority.
+        """
+        return self.down_queue.stats()
@@ -0,0 +1,167 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from Component import Component
+from ConnectionInterface import ConnectionInterface
+
+
+class Profiler:
+    """
+    Low-overhead sampling profiler for component threads.
+
+    Uses a singleton pattern so components, scripts and the FastAPI routes all toggle the same profiler.
+    While running, a background thread captures the Python stack of every thread started by a Component
+    every `interval` seconds and counts identical stacks. Threads are identified by their name
+    ('<ComponentClass>.<method>'), and the handler is the one the thread passed to a connection's listen(),
+    as recorded by the connection (see ConnectionInterface.listening_handlers). Threads that only dispatch
+    to a handler, like the FastAPI server thread, are sampled while they are running it.
+
+    Samples are wall-clock: a thread blocked on a queue is skipped, but a thread sleeping in C code
+    (e.g. time.sleep) is attributed to the Python frame that called it. Samples are taken when the sampler
+    gets the GIL, so handlers much shorter than sys.getswitchinterval() are under-represented.
+
+    Example:
+        profiler = Profiler()
+        profiler.start(interval=0.005)
+        ...
+        profiler.stop()
+        print(profiler.summary())                  # {'ComponentB.receiver': {'message_handler': 120, ...}, ...}
+        open('profile.folded', 'w').write(profiler.collapsed())  # input for flamegraph.pl / speedscope
+    """
+
+    _instance: Optional['Profiler'] = None
+
+    def __new__(cls):
+        """
+        Singleton pattern to ensure only one Profiler instance.
+        """
+        if cls._instance is None:
+            instance = super().__new__(cls)
+            instance._lock = threading.Lock()
+            instance._stacks = Counter()
+            instance._handlers = {}
+            instance._thread = None
+            instance._stop_event = threading.Event()
+            instance.interval = 0.01
+            cls._instance = instance
+        return cls._instance
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether the profiler is currently sampling.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 0.01) -> None:
+        """
+        Start sampling component threads. Does nothing if the profiler is already running.
+
+        Args:
+            interval: Seconds between samples. Defaults to 0.01 (100 Hz).
+
+        Raises:
+            ValueError: If interval is not positive.
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+
+        with self._lock:
+            if self.is_running:
+                return
+            self.interval = interval
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name="Profiler.sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling. Collected samples are kept until reset() is called.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._stop_event.set()
+            thread.join()
+
+    def reset(self) -> None:
+        """
+        Discard all collected samples.
+        """
+        with self._lock:
+            self._stacks = Counter()
+            self._handlers = {}
+
+    def _sample_loop(self) -> None:
+        """
+        Capture stacks until stopped. Runs in the profiler's own thread.
+        """
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """
+        Capture one stack of every running component thread and every thread running a handler.
+        Called periodically by the sampler thread, but can also be called directly.
+        """
+        frames = sys._current_frames()
+        threading_file = threading.__file__
+
+        samples = []
+        for thread in threading.enumerate():
+            if thread not in Component.running_threads and thread not in ConnectionInterface.listening_handlers:
+                continue
+            frame = frames.get(thread.ident)
+            if frame is None or frame.f_code.co_filename == threading_file:
+                # Thread is idle, waiting on a lock or condition
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != threading_file:
+                    stack.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            stack.reverse()
+            # Threads that don't listen on a connection are reported under their method name
+            handler = ConnectionInterface.listening_handlers.get(thread) or thread.name.rsplit('.', 1)[-1]
+            samples.append((thread.name, handler, tuple(stack)))
+
+        with self._lock:
+            for thread_name, handler, stack in samples:
+                self._stacks[(thread_name,) + stack] += 1
+                handlers = self._handlers.setdefault(thread_name, Counter())
+                handlers[handler] += 1
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return sample counts aggregated per component thread and handler.
+
+        Returns:
+            A dict mapping thread name ('<ComponentClass>.<method>') to a dict of handler name to sample count.
+        """
+        with self._lock:
+            return {thread_name: dict(handlers.most_common()) for thread_name, handlers in self._handlers.items()}
+
+    def collapsed(self) -> str:
+        """
+        Export the samples in collapsed-stack format, one 'thread;frame;...;frame count' line per stack.
+        The output can be rendered with flamegraph.pl, speedscope or inferno.
+
+        Returns:
+            The collapsed stacks as a string.
+        """
+        with self._lock:
+            stacks: Dict[Tuple[str, ...], int] = dict(self._stacks)
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(stacks.items()))
+
+    def status(self) -> dict:
+        """
+        Return whether the profiler is running, its interval and the number of samples taken.
+        """
+        with self._lock:
+            samples = sum(self._stacks.values())
+        return {"running": self.is_running, "interval": self.interval, "samples": samples}
@@ -1,24 +1,52 @@
 from queue import Queue
-from typing import Callable
+from threading import Lock
+from typing import Callable, Dict, Optional
+import itertools
 from ConnectionInterface import ConnectionInterface
+from Deadline import Deadline
+
+
+class _ReplySlot:
+    """
+    Reply to one bidirectional request, filled in by the listener.
+    ready is held until the reply is set: a bare lock is cheaper to wait on than an Event.
+    """
+
+    __slots__ = ('ready', 'reply')
+
+    def __init__(self) -> None:
+        self.ready = Lock()
+        self.ready.acquire()
+        self.reply = None
 
 
 class QueueConnection(ConnectionInterface):
-    """Implementation of Connection that uses queues for communication."""
+    """
+    Implementation of Connection that uses queues for communication.
 
-    def __init__(self, bidirectional: bool = True, contract=None) -> None:
+    The down queue carries (data, deadline, request id) tuples, with no request id on unidirectional
+    connections. The listener skips requests whose deadline passed while they were queued, and runs
+    the handler within the request's deadline so it propagates to bidirectional sends of the handler.
+    Each bidirectional request gets its own reply slot keyed by its request id, so concurrent senders
+    don't wait for each other and each one waits for its own reply only as long as its deadline allows.
+    """
+
+    def __init__(self, bidirectional: bool = True, contract=None, cache=None) -> None:
         """
         Initialize the QueueConnection.
         
         Args:
             bidirectional: Whether messages are replied to the sender. Defaults to True.
             contract: Optional DataContract for serialization/deserialization. Defaults to None.
+            cache: Optional HandlerCache wrapped around handlers passed to listen(). Defaults to None.
         """
-        super().__init__(bidirectional, contract)
+        super().__init__(bidirectional, contract, cache)
         self.down_queue: Queue = Queue()
         self.down_queue.name = "down_queue"
-        self.up_queue: Queue = Queue()
-        self.up_queue.name = "up_queue"
+        # Reply slots of the requests whose sender is still waiting, by request id
+        self._replies: Dict[int, _ReplySlot] = {}
+        self._request_ids = itertools.count()
+        self.expired = 0  # Requests dropped by the listener because their deadline had passed
 
     def listen(self, handler: Callable[[str], str]) -> None:
         """
@@ -27,29 +55,79 @@ class QueueConnection(ConnectionInterface):
         Args:
             handler: A callable function to process incoming data.
         """
+        handler = self._wrap_handler(handler)
+        inherited = Deadline.current()
         while True:
-            data = self.down_queue.get()
-            if data is None:  # Sentinel value to stop listening
+            request = self.down_queue.get()
+            if request is None:  # Sentinel value to stop listening
                 break
-            reply = handler(data)
-            if reply:
-                self.up_queue.put(reply)
+            data, deadline, request_id = request
+            if deadline is None and inherited is None:
+                # Nothing to check or propagate, skip the scope on the common path
+                reply = handler(data)
+            else:
+                if Deadline.expired(deadline):
+                    # The sender has given up already, don't spend time on a reply nobody reads
+                    self.expired += 1
+                    continue
+                with Deadline.scope(deadline):
+                    reply = handler(data)
+            if self.bidirectional:
+                slot = self._replies.pop(request_id, None)
+                if slot is not None:  # None if the sender timed out meanwhile
+                    slot.reply = reply
+                    slot.ready.release()
 
-    def send(self, data: str) -> str:
+    def send(self, data: str, priority: int = 0, timeout: Optional[float] = None) -> str:
         """
         Send data through the down queue.
         
         Args:
             data: The data to be sent as a string.
-            
+            priority: Ignored, the down queue is strict FIFO.
+            timeout: Seconds to wait for the reply. On bidirectional connections the deadline of the
+                     request being handled by the calling thread, if any, also applies. Unidirectional
+                     sends are dropped by the listener once their own timeout has passed.
+                     Defaults to None (no own timeout).
+        
         Returns:
-            The data that was sent.
+            The reply on bidirectional connections, otherwise the data that was sent.
+        
+        Raises:
+            TimeoutError: If the deadline passes before the reply arrives.
+        """
+        if not self.bidirectional:
+            # Nobody reads a reply, so no request id is needed
+            deadline = Deadline.resolve(timeout, inherit=False) if timeout is not None else None
+            self._enqueue((data, deadline, None), priority)
+            return data
+
+        deadline = Deadline.resolve(timeout)
+        request_id = next(self._request_ids)
+        slot = self._replies[request_id] = _ReplySlot()
+        try:
+            self._enqueue((data, deadline, request_id), priority)
+        except BaseException:
+            del self._replies[request_id]
+            raise
+
+        remaining = Deadline.remaining(deadline)
+        if not slot.ready.acquire(timeout=-1 if remaining is None else remaining):
+            if self._replies.pop(request_id, None) is not None:
+                raise TimeoutError(f"No reply within the deadline on {self.__class__.__name__}")
+            # The listener took the slot just now, its reply is about to be set
+            slot.ready.acquire()
+        return slot.reply
+
+    def _enqueue(self, request: tuple, priority: int) -> None:
+        """
+        Put a request on the down queue. Subclasses override this to honour the priority.
+        
+        Args:
+            request: The (data, deadline, request id) tuple to be queued.
+            priority: Priority lane requested by the sender.
         """
-        self.down_queue.put(data)
-        if self.bidirectional:
-            reply = self.up_queue.get()
-            return reply
-        return data
+        self.down_queue.put(request)
 
     def stop_listening(self) -> None:
         """
@@ -0,0 +1,288 @@
+import dataclasses
+import keyword
+import struct
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+from DataContract import DataContract
+
+
+class RecordContract(DataContract):
+    """
+    Data contract compiled from a record schema into a compact binary format.
+
+    The schema is a dataclass or a list of (name, type) pairs with types int, float, bool, str or bytes.
+    Fixed-size fields are packed with a single precompiled struct, followed by one length per
+    str/bytes field and the variable-size data itself:
+
+        [int: q][float: d][bool: ?]... [length of each str/bytes field: I]... [str/bytes data]...
+
+    Records decode into instances of `record_type`, a generated class with __slots__. Batches can be
+    decoded into a NumPy structured array with deserialize_batch() (requires numpy).
+
+    Example:
+        @dataclass
+        class Reading:
+            sensor: str
+            value: float
+            count: int
+
+        contract = RecordContract(Reading)
+        frame = contract.serialize(Reading("t1", 21.5, 3))  # bytes
+        record = contract.deserialize(frame)               # ReadingRecord(sensor='t1', value=21.5, count=3)
+    """
+
+    FIELD_CODES = {int: 'q', float: 'd', bool: '?'}
+    VARIABLE_TYPES = (str, bytes)
+
+    def __init__(self, schema: Union[type, Sequence[Tuple[str, type]]], validate: bool = True, encoding: str = 'utf-8') -> None:
+        """
+        Initialize the RecordContract and compile its encoder and decoder.
+
+        Args:
+            schema: A dataclass, or a sequence of (field name, field type) pairs.
+            validate: Whether serialize() checks field types before packing. Defaults to True.
+            encoding: Encoding of str fields. Defaults to 'utf-8'.
+
+        Raises:
+            TypeError: If the schema is not a dataclass or field list, a field name is not a valid identifier
+                       or is reserved ('self' or a __dunder__ name), or a field type is not supported.
+            ValueError: If the schema has no fields or a field name is used twice.
+        """
+        self.fields: List[Tuple[str, type]] = self._parse_schema(schema)
+        self.validate = validate
+        self.encoding = encoding
+
+        fixed = [(name, field_type) for name, field_type in self.fields if field_type not in self.VARIABLE_TYPES]
+        variable = [(name, field_type) for name, field_type in self.fields if field_type in self.VARIABLE_TYPES]
+        self._header = struct.Struct('<' + ''.join(self.FIELD_CODES[field_type] for _, field_type in fixed) + 'I' * len(variable))
+
+        record_name = f"{schema.__name__}Record" if isinstance(schema, type) else 'Record'
+        self.record_type: type = self._make_record_type(record_name, [name for name, _ in self.fields])
+        self._encode, self._decode = self._compile(fixed, variable)
+        self._exact_check = self._compile_exact_check()
+
+    @classmethod
+    def _parse_schema(cls, schema: Union[type, Sequence[Tuple[str, type]]]) -> List[Tuple[str, type]]:
+        """
+        Turn a dataclass or field list into a list of (name, type) pairs and check the types.
+        """
+        if dataclasses.is_dataclass(schema) and isinstance(schema, type):
+            fields = [(field.name, field.type) for field in dataclasses.fields(schema)]
+        elif isinstance(schema, (list, tuple)):
+            fields = [(name, field_type) for name, field_type in schema]
+        else:
+            raise TypeError(f"Expected a dataclass or a list of (name, type) pairs, got {type(schema).__name__}")
+
+        if not fields:
+            raise ValueError("A record schema needs at least one field")
+        seen = set()
+        for name, field_type in fields:
+            if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name):
+                raise TypeError(f"Field name {name!r} is not a valid identifier")
+            # Dunder names would replace methods of the record type, 'self' reads like the instance
+            if name == 'self' or (name.startswith('__') and name.endswith('__')):
+                raise TypeError(f"Field name {name!r} is reserved")
+            if name in seen:
+                raise ValueError(f"Duplicate field name {name!r}")
+            seen.add(name)
+            if field_type not in cls.FIELD_CODES and field_type not in cls.VARIABLE_TYPES:
+                raise TypeError(f"Unsupported type for field '{name}': {field_type!r}. Supported: int, float, bool, str, bytes")
+        return fields
+
+    @staticmethod
+    def _make_record_type(class_name: str, names: List[str]) -> type:
+        """
+        Create a lightweight record class with __slots__, a positional/keyword __init__, __repr__ and __eq__.
+        """
+        def __repr__(self) -> str:
+            return f"{class_name}({', '.join(f'{name}={getattr(self, name)!r}' for name in names)})"
+
+        def __eq__(self, other: Any) -> bool:
+            if type(other) is not type(self):
+                return NotImplemented
+            return all(getattr(self, name) == getattr(other, name) for name in names)
+
+        # The instance parameter has a dunder name, which _parse_schema rejects for fields
+        namespace: Dict[str, Any] = {}
+        arguments = ', '.join(names)
+        assignments = '\n'.join(f"    __record__.{name} = {name}" for name in names)
+        exec(f"def __init__(__record__, {arguments}):\n{assignments}\n", {}, namespace)
+
+        return type(class_name, (), {
+            '__slots__': tuple(names),
+            '__init__': namespace['__init__'],
+            '__repr__': __repr__,
+            '__eq__': __eq__,
+            '__hash__': None,
+        })
+
+    def _compile(self, fixed: List[Tuple[str, type]], variable: List[Tuple[str, type]]):
+        """
+        Generate specialised encode(record) -> bytes and decode(bytes) -> record functions for the schema.
+        """
+        def encoded(name: str, field_type: type) -> str:
+            return f"record.{name}.encode(encoding)" if field_type is str else f"record.{name}"
+
+        def decoded(index: int, field_type: type) -> str:
+            value = f"data[offset:offset + n{index}]"
+            return f"{value}.decode(encoding)" if field_type is str else value
+
+        variable_values = [f"v{index} = {encoded(name, field_type)}" for index, (name, field_type) in enumerate(variable)]
+        pack_arguments = [f"record.{name}" for name, _ in fixed] + [f"len(v{index})" for index in range(len(variable))]
+        encode_source = "def encode(record):\n"
+        encode_source += ''.join(f"    {line}\n" for line in variable_values)
+        if variable:
+            encode_source += f"    return b''.join((pack({', '.join(pack_arguments)}), {', '.join(f'v{index}' for index in range(len(variable)))}))\n"
+        else:
+            encode_source += f"    return pack({', '.join(pack_arguments)})\n"
+
+        # Decoded values are held in f_<name> locals so field names can't clash with the generated code
+        unpacked = [f"f_{name}" for name, _ in fixed] + [f"n{index}" for index in range(len(variable))]
+        decode_source = "def decode(data):\n"
+        decode_source += f"    {', '.join(unpacked)}, = unpack_from(data, 0)\n"
+        decode_source += "    offset = header_size\n"
+        for index, (name, field_type) in enumerate(variable):
+            decode_source += f"    f_{name} = {decoded(index, field_type)}\n"
+            decode_source += f"    offset += n{index}\n"
+        decode_source += "    if offset != len(data):\n"
+        decode_source += "        raise ValueError(f'Record frame has {len(data)} bytes, expected {offset}')\n"
+        decode_source += f"    return record_type({', '.join(f'f_{name}' for name, _ in self.fields)})\n"
+
+        namespace = {
+            'pack': self._header.pack,
+            'unpack_from': self._header.unpack_from,
+            'header_size': self._header.size,
+            'encoding': self.encoding,
+            'record_type': self.record_type,
+        }
+        exec(encode_source, namespace)
+        exec(decode_source, namespace)
+        return namespace['encode'], namespace['decode']
+
+    def _compile_exact_check(self):
+        """
+        Generate a check(record) -> bool function that accepts records whose fields have exactly the declared
+        types. It is the fast path of validation, anything it rejects goes through the full _check().
+        """
+        conditions = [
+            f"type(record.{name}) in (float, int)" if field_type is float else f"type(record.{name}) is {field_type.__name__}"
+            for name, field_type in self.fields
+        ]
+        namespace: Dict[str, Any] = {}
+        exec(f"def check(record):\n    return {' and '.join(conditions)}\n", namespace)
+        return namespace['check']
+
+    def _check(self, record: Any) -> None:
+        """
+        Check that every field of the record has the declared type.
+
+        Raises:
+            TypeError: If a field is missing or has the wrong type.
+        """
+        for name, field_type in self.fields:
+            try:
+                value = getattr(record, name)
+            except AttributeError:
+                raise TypeError(f"Record is missing field '{name}'") from None
+            # bool is a subclass of int, but int and float fields should not silently accept True
+            if field_type is float:
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            elif field_type is int:
+                valid = isinstance(value, int) and not isinstance(value, bool)
+            else:
+                valid = isinstance(value, field_type)
+            if not valid:
+                raise TypeError(f"Field '{name}' expected {field_type.__name__}, got {type(value).__name__}")
+
+    def serialize(self, data: any) -> bytes:
+        """
+        Serialize a record to the compact binary format.
+
+        Args:
+            data: An instance of record_type, a dataclass instance or any object with the schema's
+                  attributes, or a dict with the schema's keys.
+
+        Returns:
+            The encoded record as bytes.
+
+        Raises:
+            TypeError: If validation is enabled and a field is missing or has the wrong type.
+            ValueError: If a value does not fit its field (e.g. an int outside 64 bits).
+        """
+        if isinstance(data, dict):
+            data = self.record_type(**data)
+        if self.validate:
+            try:
+                exact = self._exact_check(data)
+            except AttributeError:
+                exact = False
+            if not exact:
+                self._check(data)
+        try:
+            return self._encode(data)
+        except struct.error as e:
+            raise ValueError(f"Record does not fit the schema: {e}") from e
+
+    def deserialize(self, data: bytes) -> any:
+        """
+        Deserialize bytes produced by serialize() into a record_type instance.
+
+        Args:
+            data: The encoded record.
+
+        Returns:
+            An instance of record_type.
+
+        Raises:
+            TypeError: If data is not bytes-like.
+            ValueError: If data is too short or too long for the schema.
+        """
+        if not isinstance(data, bytes):
+            if not isinstance(data, (bytearray, memoryview)):
+                raise TypeError(f"Expected bytes, got {type(data).__name__}")
+            data = bytes(data)
+        try:
+            return self._decode(data)
+        except struct.error as e:
+            raise ValueError(f"Record frame is too short: {e}") from e
+
+    def numpy_dtype(self):
+        """
+        Return the NumPy structured dtype matching the schema. str and bytes fields are stored as objects.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        import numpy as np
+
+        numpy_types = {int: '<i8', float: '<f8', bool: '?', str: object, bytes: object}
+        return np.dtype([(name, numpy_types[field_type]) for name, field_type in self.fields])
+
+    def deserialize_batch(self, frames: Iterable[bytes]):
+        """
+        Deserialize a batch of encoded records into a NumPy structured array, one row per record.
+
+        Schemas without str/bytes fields are decoded in one step with numpy.frombuffer.
+
+        Args:
+            frames: Encoded records produced by serialize().
+
+        Returns:
+            A numpy.ndarray with dtype numpy_dtype().
+
+        Raises:
+            ImportError: If numpy is not installed.
+            ValueError: If a frame does not match the schema.
+        """
+        import numpy as np
+
+        dtype = self.numpy_dtype()
+        frames = list(frames)
+        if all(field_type not in self.VARIABLE_TYPES for _, field_type in self.fields):
+            if any(len(frame) != self._header.size for frame in frames):
+                raise ValueError(f"Every record frame must be {self._header.size} bytes")
+            # The packed layout ('<' + fixed codes, no padding) is exactly the structured dtype's layout
+            return np.frombuffer(b''.join(frames), dtype=dtype).copy()
+
+        names = [name for name, _ in self.fields]
+        rows = [tuple(getattr(record, name) for name in names) for record in map(self.deserialize, frames)]
+        return np.array(rows, dtype=dtype)
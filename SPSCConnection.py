@@ -0,0 +1,119 @@
+from collections import deque
+from queue import Empty
+from threading import Event
+from typing import Any, Optional
+import os
+import time
+from QueueConnection import QueueConnection
+
+
+class SPSCChannel:
+    """
+    Single-producer/single-consumer channel built on collections.deque.
+
+    deque.append and deque.popleft are atomic, so with exactly one producer and one consumer thread
+    no lock is needed to pass items. The consumer spins briefly, yielding the GIL, before it blocks
+    on an Event; the producer only sets the Event when the consumer announced it is blocking, so a
+    busy link passes items without any lock or condition variable. Spinning only pays off when the
+    producer can run on another core, so by default single-CPU hosts block immediately.
+
+    Using a channel from more than one producer or more than one consumer thread is not supported,
+    except for the single shutdown sentinel that stop_listening() puts from another thread.
+    """
+
+    DEFAULT_SPIN = 16 if (os.cpu_count() or 1) > 1 else 0
+
+    def __init__(self, spin: Optional[int] = None) -> None:
+        """
+        Initialize the SPSCChannel.
+
+        Args:
+            spin: Number of times the consumer polls (yielding the GIL) before blocking.
+                  Defaults to None, which uses DEFAULT_SPIN (16, or 0 on a single CPU).
+        """
+        self._items: deque = deque()
+        self._wake_up = Event()
+        self._waiting = False
+        self.spin = self.DEFAULT_SPIN if spin is None else spin
+
+    def put(self, item: Any) -> None:
+        """
+        Append an item. Must only be called from the producer thread.
+
+        Args:
+            item: The item to append.
+        """
+        self._items.append(item)
+        if self._waiting:
+            self._wake_up.set()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Remove and return the oldest item, blocking until one is available.
+        Must only be called from the consumer thread.
+
+        Args:
+            timeout: Maximum seconds to block, None to block until an item arrives. Defaults to None.
+
+        Returns:
+            The oldest item.
+
+        Raises:
+            queue.Empty: If no item arrived within timeout seconds.
+        """
+        items = self._items
+        for _ in range(self.spin):
+            if items:
+                return items.popleft()
+            time.sleep(0)
+
+        end = None if timeout is None else time.monotonic() + timeout
+        while not items:
+            # Announce before the last check: the producer either sees the flag or we see its item
+            self._wake_up.clear()
+            self._waiting = True
+            if not items:
+                if end is None:
+                    self._wake_up.wait()
+                else:
+                    self._wake_up.wait(max(0.0, end - time.monotonic()))
+            self._waiting = False
+            if not items and end is not None and time.monotonic() >= end:
+                raise Empty
+        return items.popleft()
+
+    def qsize(self) -> int:
+        """
+        Return the number of queued items.
+        """
+        return len(self._items)
+
+
+class SPSCConnection(QueueConnection):
+    """
+    QueueConnection for links with exactly one sending and one listening thread.
+
+    The down queue is an SPSCChannel instead of queue.Queue, which takes a mutex and notifies a
+    condition on every put and get. This lowers the per-message overhead of busy one-way links such
+    as A to B in main.py. It does not make round trips faster: a consumer that has to block still
+    wakes up through a threading.Event, and replies use the reply slots of QueueConnection, so on
+    bidirectional links the latency is the same as with a queue. Do not use it for fan-in links like
+    the log connection, where several components send on the same connection.
+
+    Example:
+        connection = Connection('spsc', bidirectional=False, contract=Message())
+    """
+
+    def __init__(self, bidirectional: bool = True, contract=None, cache=None, spin: Optional[int] = None) -> None:
+        """
+        Initialize the SPSCConnection.
+
+        Args:
+            bidirectional: Whether messages are replied to the sender. Defaults to True.
+            contract: Optional DataContract for serialization/deserialization. Defaults to None.
+            cache: Optional HandlerCache wrapped around handlers passed to listen(). Defaults to None.
+            spin: Number of polls before a waiting thread blocks. Defaults to None (SPSCChannel.DEFAULT_SPIN).
+        """
+        super().__init__(bidirectional, contract, cache)
+        self.down_queue: SPSCChannel = SPSCChannel(spin)
+        self.down_queue.name = "down_queue"
@@ -0,0 +1,398 @@
+import bisect
+import functools
+import itertools
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+from ConnectionInterface import ConnectionInterface
+from Deadline import Deadline
+from QueueConnection import QueueConnection
+
+
+class _ReplicaConnection(QueueConnection):
+    """
+    Queue connection of one replica that reports every request it puts on its down queue.
+    """
+
+    def __init__(self, bidirectional: bool, contract, enqueued: Callable[[], None]) -> None:
+        super().__init__(bidirectional, contract)
+        self._enqueued = enqueued
+
+    def _enqueue(self, request: tuple, priority: int) -> None:
+        super()._enqueue(request, priority)
+        self._enqueued()
+
+
+class _Replica:
+    """
+    One listening replica: its own queue connection plus load counters.
+    """
+
+    def __init__(self, replica_id: int, bidirectional: bool, contract, enqueued: Callable[['_Replica'], None]) -> None:
+        self.replica_id = replica_id
+        self.connection = _ReplicaConnection(bidirectional, contract, functools.partial(enqueued, self))
+        # Written only by senders (under the ShardedConnection lock) and only by the replica thread
+        self.sent = 0
+        self.handled = 0
+        # Sends that chose this replica but have not queued their request yet, under the ShardedConnection lock
+        self.dispatching = 0
+        self.removed = False
+        # Thread running the hedged sends to this replica one at a time, like its listener serves them
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.outstanding = 0  # Hedged sends submitted to the executor and not finished, under the lock
+
+    @property
+    def pending(self) -> int:
+        """
+        Messages dispatched to the replica that it has not started handling yet.
+        """
+        return self.sent - self.handled
+
+
+class ShardedConnection(ConnectionInterface):
+    """
+    Connection that spreads messages over several replicas of the same listening component.
+
+    Every call to listen() adds a replica with its own queue, so running N instances of a Component
+    on the same ShardedConnection gives N replicas. send() picks a replica with the strategy:
+    - 'round_robin': replicas in turn
+    - 'least_loaded': the replica with the fewest messages waiting
+    - 'hash': consistent hashing on a key extracted from the data, so all messages with the same key
+      go to the same replica and keep their order
+
+    The key is key(data) if a key function is given, otherwise the data deserialized with the contract,
+    otherwise the data itself. Replicas can be added at runtime by starting another listening component,
+    and removed with remove_replica(); a removed replica finishes the messages already queued for it.
+    Keys that move to another replica may briefly be handled out of order while the old one drains.
+
+    On bidirectional connections, hedge_after enables hedged requests: if a replica has not replied
+    after hedge_after seconds, the request is also sent to a second replica and the first reply wins.
+    This bounds tail latency when one replica stalls, at the cost of handling some requests twice, so
+    only use it with idempotent handlers. Hedged requests of one key may overtake each other.
+    Each replica gets one thread for hedged sends, so a stalled replica only holds up its own thread,
+    and requests avoid a replica that still owes a reply while another replica has none pending.
+
+    Example:
+        connection_b_c = Connection('sharded', bidirectional=True, contract=Message(), strategy='hash')
+        replicas = [ComponentC(connection_forward=connection_b_c, log_connection=log_connection) for _ in range(4)]
+    """
+
+    def __init__(self, bidirectional: bool = True, contract=None, cache=None,
+                 strategy: Literal['round_robin', 'least_loaded', 'hash'] = 'round_robin',
+                 key: Optional[Callable[[Any], Any]] = None, virtual_nodes: int = 64,
+                 hedge_after: Optional[float] = None) -> None:
+        """
+        Initialize the ShardedConnection.
+
+        Args:
+            bidirectional: Whether messages are replied to the sender. Defaults to True.
+            contract: Optional DataContract for serialization/deserialization. Defaults to None.
+            cache: Optional HandlerCache wrapped around handlers passed to listen(), shared by all replicas.
+            strategy: How to choose a replica: 'round_robin', 'least_loaded' or 'hash'. Defaults to 'round_robin'.
+            key: Optional function extracting the sharding key from the sent data, used by 'hash'.
+            virtual_nodes: Points per replica on the consistent hash ring. Defaults to 64.
+            hedge_after: Seconds after which a bidirectional request is also sent to a second replica.
+                         Defaults to None (no hedging).
+
+        Raises:
+            ValueError: If the strategy is not supported.
+        """
+        if strategy not in ('round_robin', 'least_loaded', 'hash'):
+            raise ValueError(f"Unsupported strategy: {strategy}. Supported: 'round_robin', 'least_loaded', 'hash'")
+        super().__init__(bidirectional, contract, cache)
+
+        self.strategy = strategy
+        self.key = key
+        self.virtual_nodes = virtual_nodes
+        self.hedge_after = hedge_after
+        self.hedged_requests = 0  # Requests that were sent to a second replica
+        self.hedge_wins = 0  # Hedged requests answered first by the second replica
+
+        self._lock = Lock()
+        self._replica_added = Condition(self._lock)
+        self._replicas: Dict[int, _Replica] = {}
+        self._replica_ids = itertools.count()
+        self._round_robin = itertools.count()
+        self._ring: List[Tuple[int, int]] = []  # Sorted (hash, replica_id) points of the consistent hash ring
+
+    @staticmethod
+    def _hash(value: Any) -> int:
+        """
+        Stable hash of a key, identical across processes (unlike the built-in hash() of str).
+        """
+        return zlib.crc32(repr(value).encode('utf-8'))
+
+    def _key_of(self, data: str) -> Any:
+        """
+        Extract the sharding key from the sent data.
+        """
+        if self.key is not None:
+            return self.key(data)
+        if self.contract is not None:
+            return self.contract.deserialize(data)
+        return data
+
+    def _choose(self, point: Optional[int], deadline: Optional[float]) -> _Replica:
+        """
+        Pick a replica, waiting until at least one replica is listening.
+        Must be called with the lock held.
+
+        Args:
+            point: Hash of the data's key for the 'hash' strategy, None otherwise.
+            deadline: Deadline of the send, see Deadline.
+
+        Raises:
+            TimeoutError: If no replica is listening before the deadline.
+        """
+        while not self._replicas:
+            if Deadline.expired(deadline):
+                raise TimeoutError("No replica listening within the deadline on ShardedConnection")
+            self._replica_added.wait(Deadline.remaining(deadline))
+
+        if self.strategy == 'hash':
+            index = bisect.bisect(self._ring, (point, -1)) % len(self._ring)
+            return self._replicas[self._ring[index][1]]
+        replicas = list(self._replicas.values())
+        start = next(self._round_robin) % len(replicas)
+        if self.strategy == 'least_loaded':
+            # Scan from the round-robin position so ties are spread over the replicas
+            return min(replicas[start:] + replicas[:start], key=lambda replica: replica.pending)
+        return replicas[start]
+
+    def _choose_backup(self, primary: _Replica, point: Optional[int]) -> Optional[_Replica]:
+        """
+        Pick a second replica for a hedged request, or None if there is no other replica.
+        Prefers replicas without outstanding hedged sends, which may be stalled.
+        Must be called with the lock held.
+        """
+        if self.strategy == 'hash':
+            # The next replicas clockwise on the ring, which would take over the key if primary left
+            start = bisect.bisect(self._ring, (point, -1))
+            candidates = []
+            for offset in range(len(self._ring)):
+                replica = self._replicas[self._ring[(start + offset) % len(self._ring)][1]]
+                if replica is not primary and replica not in candidates:
+                    candidates.append(replica)
+        else:
+            candidates = sorted((replica for replica in self._replicas.values() if replica is not primary),
+                                key=lambda replica: replica.pending)
+        return next((replica for replica in candidates if not replica.outstanding), candidates[0] if candidates else None)
+
+    def send(self, data: str, priority: int = 0, timeout: Optional[float] = None) -> str:
+        """
+        Send data to the replica chosen by the strategy.
+
+        Args:
+            data: The data to be sent as a string.
+            priority: Ignored, each replica serves its queue in FIFO order.
+            timeout: Seconds to wait for the reply. On bidirectional connections the deadline of the request
+                     being handled by the calling thread, if any, also applies. Defaults to None (no own timeout).
+
+        Returns:
+            The reply of the replica on bidirectional connections, otherwise the data that was sent.
+
+        Raises:
+            TimeoutError: If the deadline passes before a reply arrives.
+        """
+        deadline = Deadline.resolve(timeout, inherit=self.bidirectional)
+        # Extract the key outside the lock, deserializing may be expensive
+        point = self._hash(self._key_of(data)) if self.strategy == 'hash' else None
+        hedged = self.bidirectional and self.hedge_after is not None
+        with self._lock:
+            replica = self._choose(point, deadline)
+            if hedged and replica.outstanding:
+                # Don't queue behind a reply the replica still owes, it may be stalled
+                backup = self._choose_backup(replica, point)
+                if backup is not None and not backup.outstanding:
+                    replica = backup
+            replica.sent += 1
+            replica.dispatching += 1
+
+        if not hedged:
+            return replica.connection.send(data, priority, Deadline.remaining(deadline))
+        return self._send_hedged(replica, point, data, priority, deadline)
+
+    def _send_hedged(self, primary: _Replica, point: Optional[int], data: str, priority: int, deadline: Optional[float]) -> str:
+        """
+        Send data to primary and, if it has not replied after hedge_after seconds, also to a backup replica.
+        Returns the first successful reply. The slower send is cancelled if it has not started yet,
+        otherwise it finishes in the background and its reply is dropped.
+        """
+        first = self._submit(primary, data, priority, deadline)
+        remaining = Deadline.remaining(deadline)
+        done, _ = wait([first], timeout=self.hedge_after if remaining is None else min(self.hedge_after, remaining))
+        if done:
+            return first.result()
+
+        with self._lock:
+            backup = self._choose_backup(primary, point)
+            if backup is not None:
+                backup.sent += 1
+                backup.dispatching += 1
+                self.hedged_requests += 1
+        if backup is None:
+            done, _ = wait([first], timeout=Deadline.remaining(deadline))
+            if not done:
+                raise TimeoutError("No reply within the deadline on ShardedConnection")
+            return first.result()
+
+        second = self._submit(backup, data, priority, deadline)
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=Deadline.remaining(deadline), return_when=FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError("No reply within the deadline on ShardedConnection")
+                for future in done:
+                    if future.exception() is None:
+                        if future is second:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+        # Both replicas failed, report the primary's error
+        return first.result()
+
+    def _submit(self, replica: _Replica, data: str, priority: int, deadline: Optional[float]) -> Future:
+        """
+        Run a send to a replica in the replica's hedging thread, within the caller's deadline.
+        The replica must have been chosen with sent and dispatching counted for this send.
+        """
+        with self._lock:
+            if replica.executor is None:
+                replica.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ShardedConnection.hedge{replica.replica_id}")
+            replica.outstanding += 1
+        future = replica.executor.submit(self._send_within, replica, data, priority, deadline)
+        future.add_done_callback(lambda future: self._attempt_done(replica, future))
+        return future
+
+    @staticmethod
+    def _send_within(replica: _Replica, data: str, priority: int, deadline: Optional[float]) -> str:
+        """
+        Send to a replica under the deadline of the original caller, measured from when the send started.
+        """
+        with Deadline.scope(deadline):
+            return replica.connection.send(data, priority)
+
+    def _attempt_done(self, replica: _Replica, future: Future) -> None:
+        """
+        Account for a finished hedged send. A send cancelled before it started never reached the replica.
+        """
+        with self._lock:
+            replica.outstanding -= 1
+            if not future.cancelled():
+                return
+            replica.sent -= 1
+        self._enqueued(replica)
+
+    def listen(self, handler: Callable[[str], str]) -> None:
+        """
+        Add a replica and process the messages dispatched to it with the handler function.
+        Returns when the replica is removed with remove_replica() or stop_listening().
+
+        Args:
+            handler: A callable function to process incoming data.
+        """
+        handler = self._wrap_handler(handler)
+
+        with self._lock:
+            replica = _Replica(next(self._replica_ids), self.bidirectional, self.contract, self._enqueued)
+            self._replicas[replica.replica_id] = replica
+            for node in range(self.virtual_nodes):
+                bisect.insort(self._ring, (self._hash(f"{replica.replica_id}#{node}"), replica.replica_id))
+            self._replica_added.notify_all()
+
+        @functools.wraps(handler)  # Keeps the handler's name for the Profiler
+        def replica_handler(data: str) -> str:
+            replica.handled += 1
+            return handler(data)
+
+        try:
+            replica.connection.listen(replica_handler)
+        finally:
+            with self._lock:
+                self._detach(replica.replica_id)
+            if replica.executor is not None:
+                replica.executor.shutdown(wait=False)
+
+    def _enqueued(self, replica: _Replica) -> None:
+        """
+        Called by a replica's connection once a dispatched request is on its queue, or when a dispatched
+        hedged send is cancelled. Stops a removed replica after the last request dispatched to it,
+        so no request lands behind its stop sentinel.
+        """
+        with self._lock:
+            replica.dispatching -= 1
+            stop = replica.removed and replica.dispatching == 0
+        if stop:
+            replica.connection.stop_listening()
+
+    def _detach(self, replica_id: int) -> Optional[_Replica]:
+        """
+        Remove a replica from routing. Must be called with the lock held.
+
+        Returns:
+            The removed replica, or None if it was not attached.
+        """
+        replica = self._replicas.pop(replica_id, None)
+        if replica is not None:
+            self._ring = [point for point in self._ring if point[1] != replica_id]
+        return replica
+
+    def replicas(self) -> List[int]:
+        """
+        Return the ids of the replicas currently receiving messages.
+        """
+        with self._lock:
+            return list(self._replicas)
+
+    def remove_replica(self, replica_id: Optional[int] = None) -> None:
+        """
+        Stop sending to a replica. Its listen() returns after the messages already queued for it.
+
+        Args:
+            replica_id: Id of the replica to remove, see replicas(). Defaults to the most recently added one.
+
+        Raises:
+            KeyError: If there is no such replica.
+        """
+        with self._lock:
+            if replica_id is None:
+                if not self._replicas:
+                    raise KeyError("No replicas to remove")
+                replica_id = max(self._replicas)
+            replica = self._detach(replica_id)
+            if replica is not None:
+                replica.removed = True
+                # Otherwise the last send still dispatching to the replica stops it, see _enqueued()
+                stop = replica.dispatching == 0
+        if replica is None:
+            raise KeyError(f"No replica with id {replica_id}")
+        if stop:
+            replica.connection.stop_listening()
+
+    def stop_listening(self) -> None:
+        """
+        Remove all replicas.
+        """
+        for replica_id in self.replicas():
+            try:
+                self.remove_replica(replica_id)
+            except KeyError:
+                pass  # Removed concurrently
+
+    def stats(self) -> Dict[int, dict]:
+        """
+        Return per-replica counters.
+
+        Returns:
+            A dict mapping replica id to a dict with 'sent', 'handled' and 'pending'.
+        """
+        with self._lock:
+            return {
+                replica_id: {'sent': replica.sent, 'handled': replica.handled, 'pending': replica.pending}
+                for replica_id, replica in self._replicas.items()
+            }
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+import re
+import timeit
+from Message import Message
+from RecordContract import RecordContract
+
+
+@dataclass
+class Reading:
+    """
+    Multi-field record used to compare the binary RecordContract with a string-based format.
+    """
+    sensor: str
+    value: float
+    count: int
+    valid: bool
+
+
+class ReadingStringFormat:
+    """
+    String-based format for Reading in the style of Message: f-string formatting and a regex.
+    """
+
+    PATTERN = re.compile(r"Reading (\S+) (-?[\d.e+-]+) (-?\d+) (True|False)")
+
+    def serialize(self, data: Reading) -> str:
+        return f"Reading {data.sensor} {data.value!r} {data.count} {data.valid}"
+
+    def deserialize(self, data: str) -> Reading:
+        match = self.PATTERN.match(data)
+        return Reading(match.group(1), float(match.group(2)), int(match.group(3)), match.group(4) == 'True')
+
+
+def measure(name: str, contract, value, number: int) -> None:
+    """
+    Time serialize and deserialize of one value and print the results per call.
+    """
+    frame = contract.serialize(value)
+    serialize = timeit.timeit(lambda: contract.serialize(value), number=number) / number
+    deserialize = timeit.timeit(lambda: contract.deserialize(frame), number=number) / number
+    print(f"{name:<36} {len(frame):>6} B {serialize * 1e6:>10.2f} us {deserialize * 1e6:>12.2f} us")
+
+
+def main():
+    """
+    Benchmark RecordContract against the string-based formats.
+    """
+    number = 100_000
+    print(f"{'contract':<36} {'size':>8} {'serialize':>13} {'deserialize':>15}")
+
+    measure("Message (int)", Message(), 123456, number)
+    integer = RecordContract([('value', int)])
+    measure("RecordContract (int)", integer, integer.record_type(123456), number)
+    measure("RecordContract (int, no validation)", RecordContract([('value', int)], validate=False), integer.record_type(123456), number)
+
+    reading = Reading("sensor-17", 21.375, 42, True)
+    measure("string format (Reading)", ReadingStringFormat(), reading, number)
+    measure("RecordContract (Reading)", RecordContract(Reading), reading, number)
+
+    # Batch decoding into a NumPy structured array
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("numpy not installed, skipping batch benchmark")
+        return
+
+    batch_size = 10_000
+    fixed = RecordContract([('value', float), ('count', int), ('valid', bool)])
+    frames = [fixed.serialize({'value': float(i), 'count': i, 'valid': i % 2 == 0}) for i in range(batch_size)]
+    per_record = timeit.timeit(lambda: [fixed.deserialize(frame) for frame in frames], number=10) / 10 / batch_size
+    batched = timeit.timeit(lambda: fixed.deserialize_batch(frames), number=10) / 10 / batch_size
+    print(f"{'deserialize (per record)':<36} {per_record * 1e6:>10.3f} us/record")
+    print(f"{'deserialize_batch (numpy)':<36} {batched * 1e6:>10.3f} us/record")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,16 +14,17 @@ def main():
     # Create IntegerContract for data connections
     integer_contract = Message()
     
-    # Create a unidirectional queue connection for sending data from A to B
-    connection_a_to_b = Connection('queue', bidirectional=False, contract=integer_contract)
+    # Create a unidirectional single-producer/single-consumer connection for sending data from A to B
+    connection_a_to_b = Connection('spsc', bidirectional=False, contract=integer_contract)
     
     # Create a bidirectional queue connection for two-way communication between B and C
+    # (SPSC only speeds up one-way links, round trips are no faster than with a queue)
     connection_b_c = Connection('queue', bidirectional=True, contract=integer_contract)
     
-    # Create a unidirectional queue connection for feedback from C back to A
-    feedback_connection = Connection('queue', bidirectional=False, contract=integer_contract)
+    # Create a unidirectional single-producer/single-consumer connection for feedback from C back to A
+    feedback_connection = Connection('spsc', bidirectional=False, contract=integer_contract)
     
-    # Create a unidirectional queue connection for logging
+    # Create a unidirectional queue connection for logging (all components send on it, so not SPSC)
     log_connection = Connection('queue', bidirectional=False)
     
     print("Creating ComponentA (sender), ComponentB (bidirectional with C), ComponentC (bidirectional with B), and Log component...")
@@ -56,10 +57,11 @@ def main():
             time.sleep(1)
     except KeyboardInterrupt:
         print("\nStopping all components...")
-        component_log.stop()
         component_a.stop()
         component_b.stop()
         component_c.stop()
+        # Stop the Log component last, so it flushes the messages buffered by the other components
+        component_log.stop()
         print("All components stopped.")
 
 if __name__ == '__main__':
@@ -39,8 +39,9 @@ def main():
             time.sleep(1)
     except KeyboardInterrupt:
         print("\nStopping all components...")
-        component_log.stop()
         component_web.stop()
+        # Stop the Log component last, so it flushes the messages buffered by the other components
+        component_log.stop()
         print("All components stopped.")
 
 if __name__ == '__main__':